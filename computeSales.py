@@ -5,14 +5,108 @@
 
 from __future__ import annotations
 
+import hashlib
+import io
 import json
+import os
+import pickle
 import sys
 import time
-from pathlib import Path
+from array import array
+from collections import Counter
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from itertools import groupby
+from operator import itemgetter
 from typing import Any, Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
 
-RESULTS_FILE = Path("SalesResults.txt")
+try:
+    import ijson
+except ImportError:  # pragma: no cover - optional speedup
+    ijson = None
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional speedup
+    np = None
+
+try:
+    import numba
+except ImportError:  # pragma: no cover - optional speedup
+    numba = None
+
+try:
+    from fastnumbers import fast_float
+except ImportError:  # pragma: no cover - optional speedup
+    fast_float = None
+
+try:
+    # Built via `python setup.py build_ext --inplace` (see setup.py).
+    from _compute_total import compute_total_c
+except ImportError:  # pragma: no cover - optional speedup
+    compute_total_c = None
+
+
+RESULTS_FILE = "SalesResults.txt"
+
+# Parsed catalogues are cached here, keyed by (path, mtime_ns, size).
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "computeSales")
+
+# Below this row count the JIT warmup costs more than it saves.
+NUMBA_MIN_ROWS = 10_000
+
+# Below this row count the O(N log N) sort of the grouped reduction
+# costs more than the dict lookups it amortizes.
+GROUPBY_MIN_ROWS = 10_000
+
+# Diagnostic codes. Bad rows store a small (code, *args) tuple and the
+# text is only formatted (and repeats collapsed) in build_report, so
+# pathological inputs do not pay an f-string per row.
+ERR_SALES_NOT_LIST = 0
+ERR_ROW_NOT_OBJECT = 1
+ERR_BAD_PRODUCT = 2
+ERR_BAD_QTY = 3
+WARN_UNKNOWN_PRODUCT = 4
+
+_MESSAGE_FORMATS = {
+    ERR_SALES_NOT_LIST: "[ERROR] Sales JSON must be a list.",
+    ERR_ROW_NOT_OBJECT: "[ERROR] Sales row #{0} is not an object. Skipping.",
+    ERR_BAD_PRODUCT: (
+        "[ERROR] Sales row #{0} missing/invalid Product. Skipping."
+    ),
+    ERR_BAD_QTY: "[ERROR] Invalid Quantity for '{0}'. Skipping.",
+    WARN_UNKNOWN_PRODUCT: (
+        "[WARN] Product not found in catalogue: '{0}'. Skipping."
+    ),
+}
+
+# A coded diagnostic as stored in the warnings/errors lists.
+Diagnostic = Tuple[Any, ...]
+
+
+class SalesStreamError(Exception):
+    """Raised when a streamed sales file fails to read or parse."""
+
+
+if numba is not None and np is not None:
+
+    @numba.njit(cache=True, fastmath=True, parallel=True)
+    def _sumprod(price_arr, ids, qtys):  # pragma: no cover - needs numba
+        """Masked sum of price_arr[ids] * qtys; slot -1 rows are skipped."""
+        total = 0.0
+        for i in numba.prange(ids.shape[0]):
+            slot = ids[i]
+            if slot >= 0:
+                total += price_arr[slot] * qtys[i]
+        return total
+
+else:
+    _sumprod = None
 
 
 def eprint(msg: str) -> None:
@@ -20,15 +114,106 @@ def eprint(msg: str) -> None:
     print(msg, file=sys.stderr)
 
 
-def load_json(path: Path) -> Optional[Any]:
-    """Load JSON from a file path."""
+def load_json(path: str) -> Optional[Any]:
+    """Load JSON from a file path.
+
+    Uses orjson (a C parser) when available. The file is read with one
+    os.open/fstat/read sequence sized to the whole file, skipping
+    BufferedIO and its extra lseek/isatty probes; parsing bytes also
+    skips the Python-side UTF-8 decode.
+    """
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
-    except (OSError, json.JSONDecodeError) as exc:
+        fd = os.open(path, os.O_RDONLY | getattr(os, "O_CLOEXEC", 0))
+        try:
+            size = os.fstat(fd).st_size
+            data = os.read(fd, size)
+            # A single sized read normally returns everything; loop
+            # just in case the kernel returns short.
+            while len(data) < size:
+                chunk = os.read(fd, size - len(data))
+                if not chunk:
+                    break
+                data += chunk
+        finally:
+            os.close(fd)
+        if orjson is not None:
+            # pylint can't introspect the compiled orjson module.
+            return orjson.loads(data)  # pylint: disable=no-member
+        return json.loads(data)
+    except (OSError, ValueError) as exc:
         eprint(f"[ERROR] Cannot load JSON from {path}: {exc}")
         return None
 
 
+def _to_float(value: Any) -> float:
+    """Convert a quantity to float with a type-dispatch fast path.
+
+    ``type is`` pointer compares skip the isinstance MRO walk for the
+    common already-numeric case; string quantities go through the
+    fastnumbers C parser when available. Raises TypeError/ValueError
+    exactly like ``float()`` for anything unconvertible.
+    """
+    vtype = type(value)
+    if vtype is float:
+        return value
+    if vtype is int:
+        return float(value)
+    if vtype is str and fast_float is not None:
+        result = fast_float(value, default=None)
+        if result is None:
+            raise ValueError(f"could not convert string to float: {value!r}")
+        return result
+    return float(value)
+
+
+def _intern_if_str(value: Any) -> Any:
+    """Intern exact-str values; anything else passes through untouched.
+
+    sys.intern raises TypeError on str subclasses, which are still
+    perfectly valid dict keys, so those take the plain probe.
+    """
+    # Exact-type check on purpose: isinstance would admit subclasses,
+    # which sys.intern rejects.
+    if type(value) is str:  # pylint: disable=unidiomatic-typecheck
+        return sys.intern(value)
+    return value
+
+
+def _sales_is_array(path: str) -> bool:
+    """True when the file's first non-whitespace byte opens a JSON array.
+
+    Used to decide whether the sales file can be streamed; non-array
+    top levels (and unreadable files) go through the one-shot loader so
+    they produce the same diagnostics and exit codes as ever.
+    """
+    try:
+        with open(path, "rb") as handle:
+            while True:
+                head = handle.read(1)
+                if not head:
+                    return False
+                if not head.isspace():
+                    return head == b"["
+    except OSError:
+        return False
+
+
+def stream_sales(path: str) -> Iterator[Any]:
+    """Yield sales rows one at a time from a JSON array file.
+
+    Uses ijson so rows are consumed as they stream in, keeping peak
+    memory at O(1) rows instead of the whole file. Read or parse
+    failures print the usual load error and raise SalesStreamError so
+    the caller fails the run instead of reporting a partial total.
+    """
+    try:
+        with open(path, "rb") as handle:
+            yield from ijson.items(handle, "item")
+    except (OSError, ijson.JSONError) as exc:
+        eprint(f"[ERROR] Cannot load JSON from {path}: {exc}")
+        raise SalesStreamError(str(exc)) from exc
+
+
 def build_price_map(catalogue: Any) -> Dict[str, float]:
     """Build a mapping of product title -> price from catalogue JSON."""
     prices: Dict[str, float] = {}
@@ -69,102 +254,493 @@ def build_price_map(catalogue: Any) -> Dict[str, float]:
             eprint(msg)
             continue
 
-        prices[title] = price_value
+        # Interned titles make later dict probes hit CPython's
+        # pointer-equality fast path instead of comparing bytes.
+        prices[sys.intern(title)] = price_value
 
     return prices
 
 
-def compute_total(
+def _catalogue_cache_file(catalogue_path: str) -> Optional[str]:
+    """Return the cache file for a catalogue, or None if it cannot stat."""
+    try:
+        stat = os.stat(catalogue_path)
+    except OSError:
+        return None
+    key = (
+        f"{os.path.abspath(catalogue_path)}|"
+        f"{stat.st_mtime_ns}|{stat.st_size}"
+    )
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.pkl")
+
+
+def load_price_map(catalogue_path: str) -> Optional[Dict[str, float]]:
+    """Load the catalogue price map, reusing a cached parse when valid.
+
+    The pickle cache is keyed by (absolute path, mtime_ns, size), so
+    any change to the catalogue file misses it; a hit skips the JSON
+    parse and validation entirely. Only fully valid catalogues are
+    cached, so a bad file keeps reporting its item errors on every run.
+    Returns None when the catalogue cannot be loaded at all.
+    """
+    cache_file = _catalogue_cache_file(catalogue_path)
+    if cache_file is not None:
+        try:
+            with open(cache_file, "rb") as handle:
+                cached = pickle.load(handle)
+            if isinstance(cached, dict):
+                # Re-intern keys: interning does not survive pickling
+                # and the hot loops rely on pointer-equality probes.
+                return {
+                    sys.intern(key): value
+                    for key, value in cached.items()
+                }
+        except Exception:  # pylint: disable=broad-exception-caught
+            # Corrupted data raises more than UnpicklingError (e.g.
+            # ValueError or AttributeError on garbage bytes); any
+            # failure here safely falls through to a full reparse.
+            pass
+
+    catalogue = load_json(catalogue_path)
+    if catalogue is None:
+        return None
+    prices = build_price_map(catalogue)
+
+    if (
+        cache_file is not None
+        and prices
+        and isinstance(catalogue, list)
+        and len(prices) == len(catalogue)
+    ):
+        try:
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            tmp_file = f"{cache_file}.{os.getpid()}.tmp"
+            with open(tmp_file, "wb") as handle:
+                pickle.dump(prices, handle, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    return prices
+
+
+def build_price_arrays(
     prices: Dict[str, float],
-    sales: Any,
-) -> Tuple[float, List[str], List[str]]:
-    """Compute total cost (negative quantities are included)."""
-    total = 0.0
-    warnings: List[str] = []
-    errors: List[str] = []
+) -> Optional[Tuple[Dict[str, int], Any]]:
+    """Build an SoA view of the catalogue for the vectorized paths.
+
+    Returns a ``title -> slot`` index plus a contiguous float64 price
+    array, so hot-loop probes read one packed array instead of chasing
+    per-entry PyFloat objects. Returns None when NumPy is unavailable.
+    """
+    if np is None:
+        return None
+    slots = {title: i for i, title in enumerate(prices)}
+    price_arr = np.fromiter(
+        prices.values(), dtype=np.float64, count=len(prices)
+    )
+    return slots, price_arr
+
+
+def _diagnose_row(
+    prices: Dict[str, float],
+    idx: int,
+    row: Any,
+) -> Tuple[bool, Diagnostic]:
+    """Classify one invalid sales row into a coded diagnostic.
+
+    Returns ``(is_warning, diagnostic)``; every bad row yields exactly
+    one diagnostic.
+    """
+    if not isinstance(row, dict):
+        return False, (ERR_ROW_NOT_OBJECT, idx)
+
+    product = row.get("Product")
+    if not isinstance(product, str) or not product.strip():
+        return False, (ERR_BAD_PRODUCT, idx)
+
+    try:
+        _to_float(row.get("Quantity"))
+    except (TypeError, ValueError):
+        return False, (ERR_BAD_QTY, product)
+
+    if product not in prices:
+        return True, (WARN_UNKNOWN_PRODUCT, product)
+
+    # Every explicit check passed, so the only fallible fast-path step
+    # left is the quantity conversion; classify unexpected failures as
+    # that rather than claiming the product is missing.
+    return False, (ERR_BAD_QTY, product)
+
+
+class _DiagnosticSink:
+    """Collects coded diagnostics split into warnings and errors.
+
+    When an upper bound on the diagnostic count is known the lists are
+    preallocated once and trimmed in finish(), so they never reallocate
+    mid-loop; with no bound they fall back to plain appends.
+    """
+
+    __slots__ = ("warnings", "errors", "_w_idx", "_e_idx", "_bounded")
+
+    def __init__(self, bound: int = 0) -> None:
+        self._bounded = bound > 0
+        self.warnings: List[Diagnostic] = [None] * bound
+        self.errors: List[Diagnostic] = [None] * bound
+        self._w_idx = 0
+        self._e_idx = 0
+
+    def add(self, is_warning: bool, diag: Diagnostic) -> None:
+        """Record one diagnostic."""
+        if is_warning:
+            if self._bounded:
+                self.warnings[self._w_idx] = diag
+            else:
+                self.warnings.append(diag)
+            self._w_idx += 1
+        else:
+            if self._bounded:
+                self.errors[self._e_idx] = diag
+            else:
+                self.errors.append(diag)
+            self._e_idx += 1
+
+    def finish(self) -> Tuple[List[Diagnostic], List[Diagnostic]]:
+        """Trim preallocated slack and return (warnings, errors)."""
+        if self._bounded:
+            del self.warnings[self._w_idx:]
+            del self.errors[self._e_idx:]
+        return self.warnings, self.errors
+
+
+def _diagnose_bad_rows(
+    prices: Dict[str, float],
+    sales: List[Any],
+    bad: Iterable[int],
+) -> Tuple[List[Diagnostic], List[Diagnostic]]:
+    """Diagnose the rows that failed a fast-path pass.
+
+    Each bad row yields exactly one diagnostic, so len(bad) is an exact
+    preallocation bound; no append-driven reallocation.
+    """
+    sink = _DiagnosticSink(len(bad))  # type: ignore[arg-type]
+    for idx in bad:
+        sink.add(*_diagnose_row(prices, idx, sales[idx]))
+    return sink.finish()
+
 
-    if not isinstance(sales, list):
-        errors.append("[ERROR] Sales JSON must be a list.")
-        return total, warnings, errors
+def _compute_total_numpy(
+    prices: Dict[str, float],
+    sales: List[Any],
+    collect_diagnostics: bool = True,
+) -> Tuple[float, List[Diagnostic], List[Diagnostic]]:
+    """Vectorized reduction over an already-materialized sales list.
+
+    One extraction pass fills parallel quantity/slot arrays, then the
+    multiply-accumulate runs inside NumPy instead of the interpreter.
+    Rows that fail the fast path keep slot -1 (excluded from the total)
+    and are diagnosed afterwards with the same messages as the scalar
+    loop.
+    """
+    slots, price_arr = build_price_arrays(prices)
+    n = len(sales)
+    qtys = np.zeros(n, dtype=np.float64)
+    ids = np.full(n, -1, dtype=np.int64)
+    # Raw 8-byte ints instead of a list of PyObject pointers; iterating
+    # the bad rows later walks one contiguous buffer.
+    bad = array("q")
+    slots_get = slots.get
 
     for idx, row in enumerate(sales):
-        if not isinstance(row, dict):
-            errors.append(
-                f"[ERROR] Sales row #{idx} is not an object. Skipping."
-            )
-            continue
+        try:
+            slot = slots_get(_intern_if_str(row["Product"]), -1)
+            if slot < 0:
+                raise KeyError(idx)
+            qtys[idx] = _to_float(row["Quantity"])
+            ids[idx] = slot
+        except (TypeError, ValueError, KeyError):
+            ids[idx] = -1
+            bad.append(idx)
+
+    if _sumprod is not None and n >= NUMBA_MIN_ROWS:
+        total = float(_sumprod(price_arr, ids, qtys))
+    else:
+        valid = ids >= 0
+        total = float(np.dot(price_arr[ids[valid]], qtys[valid]))
+
+    if collect_diagnostics:
+        return (total,) + _diagnose_bad_rows(prices, sales, bad)
+    return total, [], []
+
+
+def _group_qty_sum(
+    sales: List[Any],
+    group: Iterable[Tuple[str, int]],
+    bad: List[int],
+) -> float:
+    """Sum the quantities of one product group; bad rows go to ``bad``."""
+    qty_sum = 0.0
+    for _, idx in group:
+        try:
+            qty_sum += _to_float(sales[idx]["Quantity"])
+        except (KeyError, TypeError, ValueError):
+            bad.append(idx)
+    return qty_sum
 
-        product = row.get("Product")
-        quantity = row.get("Quantity")
 
-        if not isinstance(product, str) or not product.strip():
-            errors.append(
-                f"[ERROR] Sales row #{idx} missing/invalid Product. Skipping."
-            )
-            continue
+def _compute_total_grouped(
+    prices: Dict[str, float],
+    sales: List[Any],
+    collect_diagnostics: bool = True,
+) -> Tuple[float, List[Diagnostic], List[Diagnostic]]:
+    """Sort-and-group reduction for large materialized feeds.
+
+    POS exports cluster rows by product, so sorting (product, index)
+    pairs and reducing per group turns N price lookups and multiplies
+    into one per distinct product. Rows that fail any step keep their
+    original index and are diagnosed afterwards as usual.
+    """
+    keyed: List[Tuple[str, int]] = []
+    bad: List[int] = []
 
+    for idx, row in enumerate(sales):
         try:
-            qty = float(quantity)
-        except (TypeError, ValueError):
-            errors.append(
-                f"[ERROR] Invalid Quantity for '{product}'. Skipping."
-            )
+            product = row["Product"]
+        except (KeyError, TypeError):
+            bad.append(idx)
             continue
+        # Only str products (subclasses included) are sortable against
+        # each other; anything else is invalid anyway. Interning makes
+        # the sort and groupby comparisons pointer-equality hits for
+        # repeated names.
+        if isinstance(product, str):
+            keyed.append((_intern_if_str(product), idx))
+        else:
+            bad.append(idx)
 
-        if product not in prices:
-            warnings.append(
-                f"[WARN] Product not found in catalogue: '{product}'. "
-                "Skipping."
-            )
+    keyed.sort(key=itemgetter(0))
+
+    total = 0.0
+    comp = 0.0
+    prices_get = prices.get
+
+    for product, group in groupby(keyed, key=itemgetter(0)):
+        price = prices_get(product)
+        if price is None:
+            bad.extend(idx for _, idx in group)
             continue
+        adj = price * _group_qty_sum(sales, group, bad) - comp
+        new_total = total + adj
+        comp = (new_total - total) - adj
+        total = new_total
+
+    if not collect_diagnostics:
+        return total, [], []
+    bad.sort()
+    return (total,) + _diagnose_bad_rows(prices, sales, bad)
+
+
+def _compute_total_python(
+    prices: Dict[str, float],
+    sales: Any,
+    collect_diagnostics: bool,
+) -> Tuple[float, List[Diagnostic], List[Diagnostic]]:
+    """Fused scalar loop over any iterable of rows.
+
+    Assumes a well-formed row and lets any failure (non-dict row,
+    missing key, unknown product, bad quantity) fall into
+    _diagnose_row, which re-checks and emits the right message. Valid
+    rows are the overwhelming majority, so this trades four per-row
+    type/membership checks for one zero-cost try block. Real feeds
+    also repeat (product, qty) pairs; memoize the product so the
+    lookup and multiply run once per distinct pair.
+    """
+    memo: Dict[Tuple[str, float], float] = {}
+    memo_get = memo.get
+    to_float = _to_float
+    intern_if_str = _intern_if_str
+
+    # When the row count is known, preallocate the diagnostic lists to
+    # that bound so they never reallocate mid-loop.
+    sink = _DiagnosticSink(
+        len(sales)
+        if isinstance(sales, list) and collect_diagnostics
+        else 0
+    )
 
-        total += prices[product] * qty
+    total = 0.0
+    # Kahan-compensated accumulation: comp recaptures the low-order
+    # bits each add loses, so long feeds stay accurate without
+    # materializing every product for math.fsum.
+    comp = 0.0
 
-    return total, warnings, errors
+    for idx, row in enumerate(sales):
+        try:
+            # Catalogue keys are interned at build time, so interning
+            # the product turns the dict probes below into
+            # pointer-equality hits. str subclasses (valid keys that
+            # sys.intern rejects) pass through to a plain probe.
+            product = intern_if_str(row["Product"])
+            qty = to_float(row["Quantity"])
+            value = memo_get((product, qty))
+            if value is None:
+                value = prices[product] * qty
+                memo[(product, qty)] = value
+            value -= comp
+            comp = total
+            total += value
+            comp = (total - comp) - value
+        except (KeyError, TypeError, ValueError):
+            if collect_diagnostics:
+                sink.add(*_diagnose_row(prices, idx, row))
+
+    return (total,) + sink.finish()
+
+
+def compute_total(
+    prices: Dict[str, float],
+    sales: Any,
+    *,
+    collect_diagnostics: bool = True,
+) -> Tuple[float, List[Diagnostic], List[Diagnostic]]:
+    """Compute total cost (negative quantities are included).
+
+    ``sales`` may be a list or any other iterable of rows (e.g. the
+    generator returned by :func:`stream_sales`). Library callers that
+    only want the total can pass ``collect_diagnostics=False`` to skip
+    classifying bad rows entirely; the returned lists are then empty.
+    """
+    if not isinstance(sales, Iterable) or isinstance(sales, (str, dict)):
+        errors = [(ERR_SALES_NOT_LIST,)] if collect_diagnostics else []
+        return 0.0, [], errors
+
+    if isinstance(sales, list):
+        # Fastest first: the C extension loop, then the NumPy path.
+        if compute_total_c is not None:
+            total, bad = compute_total_c(prices, sales)
+            if collect_diagnostics:
+                return (total,) + _diagnose_bad_rows(prices, sales, bad)
+            return total, [], []
+        if np is not None:
+            return _compute_total_numpy(prices, sales, collect_diagnostics)
+        if len(sales) >= GROUPBY_MIN_ROWS:
+            return _compute_total_grouped(prices, sales, collect_diagnostics)
+
+    return _compute_total_python(prices, sales, collect_diagnostics)
+
+
+def _write_diagnostics(
+    buf: io.StringIO,
+    diagnostics: List[Diagnostic],
+) -> None:
+    """Write coded diagnostics as report lines, collapsing repeats.
+
+    Duplicate diagnostics (same code and arguments) are emitted once
+    with an occurrence count, so pathological inputs produce O(distinct)
+    lines instead of O(rows).
+    """
+    for diag, count in Counter(diagnostics).items():
+        text = _MESSAGE_FORMATS[diag[0]].format(*diag[1:])
+        if count > 1:
+            buf.write(f"- {text} (occurred {count}x)\n")
+        else:
+            buf.write(f"- {text}\n")
 
 
 def build_report(
-    catalogue_path: Path,
-    sales_path: Path,
+    catalogue_path: str,
+    sales_path: str,
     report_data: Dict[str, Any],
 ) -> str:
-    """Build a human-readable report for console and output file."""
+    """Build a human-readable report for console and output file.
+
+    The report is streamed into one StringIO buffer rather than built
+    as a list of lines and joined, skipping the intermediate list and
+    the join's extra length pass.
+    """
     total = float(report_data.get("total", 0.0))
     warnings = report_data.get("warnings", [])
     errors = report_data.get("errors", [])
     elapsed = float(report_data.get("elapsed_seconds", 0.0))
 
-    lines: List[str] = [
-        "=== Sales Computation Results ===",
-        f"Catalogue: {catalogue_path}",
-        f"Sales:     {sales_path}",
-        "",
-        f"TOTAL COST: {total:,.2f}",
-        "",
-        "Errors (skipped):",
-    ]
+    buf = io.StringIO()
+    buf.write("=== Sales Computation Results ===\n")
+    buf.write(f"Catalogue: {catalogue_path}\n")
+    buf.write(f"Sales:     {sales_path}\n\n")
+    buf.write(f"TOTAL COST: {total:,.2f}\n\n")
 
+    buf.write("Errors (skipped):\n")
     if errors:
-        lines.extend(f"- {msg}" for msg in errors)
+        _write_diagnostics(buf, errors)
     else:
-        lines.append("- None")
-
-    lines.extend(["", "Warnings (skipped):"])
+        buf.write("- None\n")
 
+    buf.write("\nWarnings (skipped):\n")
     if warnings:
-        lines.extend(f"- {msg}" for msg in warnings)
+        _write_diagnostics(buf, warnings)
     else:
-        lines.append("- None")
-
-    lines.extend(
-        [
-            "",
-            f"Elapsed time (s): {elapsed:.6f}",
-            "===============================",
-            "",
-        ]
-    )
-    return "\n".join(lines)
+        buf.write("- None\n")
+
+    buf.write(f"\nElapsed time (s): {elapsed:.6f}\n")
+    buf.write("===============================\n")
+    return buf.getvalue()
+
+
+def _load_inputs(
+    catalogue_path: str,
+    sales_path: str,
+) -> Optional[Tuple[Dict[str, float], Any]]:
+    """Load both inputs, streaming the sales file when possible.
+
+    Returns ``(prices, sales)`` or None when either load fails (the
+    loaders have already reported the error).
+    """
+    if ijson is not None and _sales_is_array(sales_path):
+        prices = load_price_map(catalogue_path)
+        if prices is None:
+            return None
+        return prices, stream_sales(sales_path)
+
+    # Overlap the two loads: disk reads run concurrently and orjson
+    # releases the GIL while parsing, so the files decode in
+    # parallel instead of back to back.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        future_prices = pool.submit(load_price_map, catalogue_path)
+        future_sales = pool.submit(load_json, sales_path)
+        prices = future_prices.result()
+        sales = future_sales.result()
+    if prices is None or sales is None:
+        return None
+    return prices, sales
+
+
+def _emit_report(report: str) -> int:
+    """Write the report to stdout and RESULTS_FILE.
+
+    Encodes once and writes raw bytes: sys.stdout.buffer skips the
+    TextIOWrapper re-encode, and os.write of the whole report skips
+    the BufferedWriter/isatty/seek probes of open()+write_text.
+    """
+    data = report.encode("utf-8")
+    sys.stdout.buffer.write(data + b"\n")
+    sys.stdout.buffer.flush()
+
+    try:
+        fd = os.open(
+            RESULTS_FILE, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+        )
+        try:
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        eprint(f"[ERROR] Could not write {RESULTS_FILE}: {exc}")
+        return 1
+
+    return 0
 
 
 def main(argv: List[str]) -> int:
@@ -177,18 +753,22 @@ def main(argv: List[str]) -> int:
         eprint(usage)
         return 2
 
-    catalogue_path = Path(argv[1])
-    sales_path = Path(argv[2])
+    catalogue_path = argv[1]
+    sales_path = argv[2]
 
     start = time.perf_counter()
 
-    catalogue = load_json(catalogue_path)
-    sales = load_json(sales_path)
-    if catalogue is None or sales is None:
+    loaded = _load_inputs(catalogue_path, sales_path)
+    if loaded is None:
         return 1
+    prices, sales = loaded
 
-    prices = build_price_map(catalogue)
-    total, warnings, errors = compute_total(prices, sales)
+    try:
+        total, warnings, errors = compute_total(prices, sales)
+    except SalesStreamError:
+        # The stream already reported the load error; fail the run
+        # rather than writing a report with a partial total.
+        return 1
 
     elapsed_seconds = time.perf_counter() - start
 
@@ -205,14 +785,7 @@ def main(argv: List[str]) -> int:
         report_data=report_data,
     )
 
-    print(report)
-    try:
-        RESULTS_FILE.write_text(report, encoding="utf-8")
-    except OSError as exc:
-        eprint(f"[ERROR] Could not write {RESULTS_FILE}: {exc}")
-        return 1
-
-    return 0
+    return _emit_report(report)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+"""Build the optional _compute_total C extension.
+
+Usage: python setup.py build_ext --inplace
+"""
+
+from setuptools import Extension, setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError as exc:
+    raise SystemExit(
+        "Cython is required to build the optional extension: "
+        "pip install cython"
+    ) from exc
+
+EXTENSIONS = [
+    Extension(
+        "_compute_total",
+        ["_compute_total.pyx"],
+        extra_compile_args=["-O3", "-march=native"],
+    )
+]
+
+setup(
+    name="computeSales-ext",
+    ext_modules=cythonize(EXTENSIONS, language_level=3),
+)